@@ -34,11 +34,26 @@ from .installable import Installable
 from .project import Project
 from .pyproject import (PyProjectOptionException,
         PyProjectUndefinedOptionException)
-from .setuptools_builder import SetuptoolsBuilder
 from .version import SIP_VERSION, SIP_VERSION_STR
 
-# This is deprecated so allow it to fail.
-try:
-    from .distutils_builder import DistutilsBuilder
-except ImportError:
-    pass
+
+def __getattr__(name):
+    """ Import the builders on demand as they pull in setuptools or
+    distutils which are expensive to import.
+    """
+
+    if name == 'SetuptoolsBuilder':
+        from .setuptools_builder import SetuptoolsBuilder
+        return SetuptoolsBuilder
+
+    if name == 'DistutilsBuilder':
+        # This is deprecated so allow it to fail.
+        try:
+            from .distutils_builder import DistutilsBuilder
+        except ImportError:
+            pass
+        else:
+            return DistutilsBuilder
+
+    raise AttributeError(
+            "module '{0}' has no attribute '{1}'".format(__name__, name))
@@ -21,23 +21,33 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+import json
 import os
 import sys
 
 from .buildable import BuildableBindings
-from .code_generator import (generateCode, generateExtracts, generateAPI,
-        generateTypeHints, py2c, transform)
 from .configurable import Configurable, Option
 from .exceptions import UserException
-from .generator import parse
 from .installable import Installable
 from .module import copy_nonshared_sources
-from .version import SIP_VERSION
+from .version import SIP_VERSION, SIP_VERSION_STR
+
+
+# The name of the file, in a buildable's build directory, that describes the
+# code most recently generated there.
+_GENERATED_STAMP = '.sip-generated'
 
 
 class Bindings(Configurable):
     """ The encapsulation of a module's bindings. """
 
+    # The old parser had no concept of the encoding of a .sip file.  For the
+    # moment we say that files should be UTF-8.  If that proves to be a problem
+    # then a project-specific encoding should be able to be specified in
+    # pyproject.toml which would apply to all .sip files that make up the
+    # project.
+    _encoding = 'UTF-8'
+
     # The configurable options.
     _options = (
         # Any bindings level builder-specific settings.
@@ -126,6 +136,8 @@ class Bindings(Configurable):
         self.project = project
         self.name = name
 
+        self._parsed = None
+
         self.initialise_options(kwargs)
 
     def apply_nonuser_defaults(self, tool):
@@ -153,21 +165,16 @@ class Bindings(Configurable):
         everything needed to build the bindings.
         """
 
-        project = self.project
+        from .code_generator import (generateCode, generateExtracts,
+                generateAPI, generateTypeHints, py2c, transform)
+        from .generator.parse_cache import get_args_key
 
-        # The old parser had no concept of the encoding of a .sip file.  For
-        # the moment we say that files should be UTF-8.  If that proves to be a
-        # problem then a project-specific encoding should be able to be
-        # specified in pyproject.toml which would apply to all .sip files that
-        # make up the project.
-        encoding = 'UTF-8'
+        project = self.project
 
         # Parse the input file.
-        spec, sip_files = parse(self.sip_file, SIP_VERSION, encoding,
-                project.abi_version, self.tags, self.disabled_features,
-                self.protected_is_public, self._sip_include_dirs)
+        spec, sip_files, parse_key = self._parse()
 
-        pt = py2c(spec, encoding)
+        pt = py2c(spec, self._encoding)
         transform(pt, True)
 
         module = spec.modules[0]
@@ -198,7 +205,7 @@ class Bindings(Configurable):
 
         # Generate any extracts.
         if self.generate_extracts:
-            generateExtracts(pt, extracts)
+            generateExtracts(pt, self.generate_extracts)
 
         # Generate any type hints file.
         if self.pep484_pyi and not self.internal:
@@ -215,11 +222,35 @@ class Bindings(Configurable):
             installable.files.append(pyi_path)
             buildable.installables.append(installable)
 
-        # Generate the bindings.
-        header, sources = generateCode(pt, buildable.build_dir,
+        # Reuse the code generated by a previous build if the files read by the
+        # parser and everything else that would affect it are unchanged.  The
+        # parse key covers the former.
+        code_key = get_args_key(parse_key, buildable.build_dir,
                 self.source_suffix, self.exceptions, self.tracing,
                 self.release_gil, self.concatenate, self.tags,
-                self.disabled_features, self.docstrings, project.py_debug)
+                self.disabled_features, self.docstrings, project.py_debug,
+                project.sip_module, project.version_info)
+
+        generated = _load_generated(buildable.build_dir, code_key)
+
+        if generated is None:
+            # Remember any existing source files so that those that are
+            # regenerated without change can keep their timestamps and won't
+            # be recompiled.
+            snapshot = _snapshot_sources(buildable.build_dir,
+                    self.source_suffix)
+
+            # Generate the bindings.
+            header, sources = generateCode(pt, buildable.build_dir,
+                    self.source_suffix, self.exceptions, self.tracing,
+                    self.release_gil, self.concatenate, self.tags,
+                    self.disabled_features, self.docstrings, project.py_debug)
+
+            _restore_unchanged_sources(snapshot)
+
+            _save_generated(buildable.build_dir, code_key, header, sources)
+        else:
+            header, sources = generated
 
         if header:
             buildable.headers.append(header)
@@ -234,6 +265,7 @@ class Bindings(Configurable):
         if project.sip_module:
             # sip.h will already be in the build directory.
             buildable.include_dirs.append(project.build_dir)
+            buildable.headers.append(os.path.join(project.build_dir, 'sip.h'))
 
             if not self.internal:
                 # Add an installable for the .sip files.
@@ -259,6 +291,8 @@ class Bindings(Configurable):
             buildable.sources.extend(
                     copy_nonshared_sources(project.abi_version.split('.')[0],
                             buildable.build_dir))
+            buildable.headers.append(
+                    os.path.join(buildable.build_dir, 'sip.h'))
 
         buildable.include_dirs.extend(self.include_dirs)
         buildable.sources.extend(self.sources)
@@ -334,3 +368,148 @@ class Bindings(Configurable):
 
         if not self.source_suffix:
             self.source_suffix = None
+
+    def _parse(self):
+        """ Parse the .sip file and return a Specification object, the list
+        of .sip files that define the bindings and a key that identifies the
+        parse and the contents of every file it looked for.  The result of a
+        previous parse is reused if none of those files (or anything else that
+        affects the parse) have changed.
+        """
+
+        # Reuse any parse already done by this object if nothing that would
+        # affect it has changed since.
+        if self._parsed is not None:
+            parse_state, parsed = self._parsed
+            if parse_state == self._get_parse_state():
+                return parsed
+
+        from .generator import parse
+        from .generator.parse_cache import get_args_key, load, store
+
+        project = self.project
+
+        # The cache lives in the build directory and so will only be reused if
+        # that is preserved between builds.  There is a single entry for each
+        # set of bindings which is checked against the files that the parser
+        # looked for (rather than every file it might have looked for).
+        cache_dir = os.path.join(project.build_dir, '.sip-parse-cache')
+
+        args_key = get_args_key(self.sip_file, SIP_VERSION, SIP_VERSION_STR,
+                self._encoding, project.abi_version, self.tags,
+                self.disabled_features, self.protected_is_public,
+                self._sip_include_dirs, os.getcwd())
+
+        # Note that the parser will add the tags and disabled features of any
+        # imported modules so these must be cached as well.
+        cached = load(cache_dir, self.name, args_key)
+
+        if cached is None:
+            dependencies = []
+
+            spec, sip_files = parse(self.sip_file, SIP_VERSION, self._encoding,
+                    project.abi_version, self.tags, self.disabled_features,
+                    self.protected_is_public, self._sip_include_dirs,
+                    dependencies=dependencies)
+
+            key = store(cache_dir, self.name, args_key, dependencies,
+                    (spec, sip_files, self.tags, self.disabled_features))
+        else:
+            key, (spec, sip_files, self.tags, self.disabled_features) = cached
+
+        self._parsed = (self._get_parse_state(), (spec, sip_files, key))
+
+        return spec, sip_files, key
+
+    def _get_parse_state(self):
+        """ Return a snapshot of the configuration that affects a parse. """
+
+        return (self.sip_file, self.project.abi_version, tuple(self.tags),
+                tuple(self.disabled_features), self.protected_is_public,
+                tuple(self._sip_include_dirs))
+
+
+def _load_generated(build_dir, key):
+    """ Return the header file and the list of source files generated by a
+    previous build with the same key or None if they aren't available.
+    """
+
+    try:
+        with open(os.path.join(build_dir, _GENERATED_STAMP)) as f:
+            generated = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if generated.get('key') != key:
+        return None
+
+    header = generated['header']
+    if header:
+        header = os.path.join(build_dir, header)
+
+    sources = [os.path.join(build_dir, s) for s in generated['sources']]
+
+    # Make sure nothing has been removed since.
+    for path in sources + ([header] if header else []):
+        if not os.path.isfile(path):
+            return None
+
+    return header, sources
+
+
+def _restore_unchanged_sources(snapshot):
+    """ Restore the timestamps of any source files in a snapshot that have
+    been re-written with the same contents.
+    """
+
+    from .generator.parse_cache import get_digest
+
+    for path, (digest, atime, mtime) in snapshot.items():
+        if get_digest(path) == digest:
+            os.utime(path, ns=(atime, mtime))
+
+
+def _save_generated(build_dir, key, header, sources):
+    """ Save the names of the header file and source files generated with a
+    key.  Any error is ignored.
+    """
+
+    generated = {
+        'key': key,
+        'header': os.path.relpath(header, build_dir) if header else None,
+        'sources': [os.path.relpath(s, build_dir) for s in sources],
+    }
+
+    try:
+        with open(os.path.join(build_dir, _GENERATED_STAMP), 'w') as f:
+            json.dump(generated, f)
+    except OSError:
+        pass
+
+
+def _snapshot_sources(build_dir, source_suffix):
+    """ Return a dict of the digest and timestamps of the source files in a
+    build directory.
+    """
+
+    from .generator.parse_cache import get_digest
+
+    suffixes = ('.c', '.cpp', '.h')
+    if source_suffix:
+        suffixes += (source_suffix, )
+
+    snapshot = {}
+
+    try:
+        it = os.scandir(build_dir)
+    except FileNotFoundError:
+        return snapshot
+
+    with it:
+        for entry in it:
+            if entry.name.endswith(suffixes) and entry.is_file():
+                st = entry.stat()
+                snapshot[entry.path] = (get_digest(entry.path),
+                        st.st_atime_ns, st.st_mtime_ns)
+
+    return snapshot
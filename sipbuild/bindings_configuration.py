@@ -28,8 +28,11 @@ from .exceptions import UserFileException, UserParseException
 from .module import resolve_abi_version
 
 
-def get_bindings_configuration(abi_major, sip_file, sip_include_dirs):
-    """ Get the configuration of a set of bindings. """
+def get_bindings_configuration(abi_major, sip_file, sip_include_dirs,
+        dependencies=None):
+    """ Get the configuration of a set of bindings.  If dependencies is not
+    None then the pathnames of the .toml files looked for are appended to it.
+    """
 
     # We make no assumption about the name of the .sip file but we assume that
     # the directory it is in is the name of the bindings.
@@ -40,6 +43,9 @@ def get_bindings_configuration(abi_major, sip_file, sip_include_dirs):
         toml_file = os.path.join(sip_dir, bindings_name,
                 bindings_name + '.toml')
 
+        if dependencies is not None:
+            dependencies.append(os.path.abspath(toml_file))
+
         if os.path.isfile(toml_file):
             break
     else:
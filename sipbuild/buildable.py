@@ -21,7 +21,7 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
-import importlib
+from importlib.machinery import EXTENSION_SUFFIXES
 import os
 import sys
 
@@ -31,6 +31,11 @@ from .py_versions import OLDEST_SUPPORTED_MINOR
 from .version import SIP_VERSION_STR
 
 
+# The filename extension of a module that uses the limited API (if there is
+# one).
+_ABI3_SUFFIX = next((s for s in EXTENSION_SUFFIXES if '.abi3' in s), None)
+
+
 class Buildable:
     """ Encapsulate the components used to build something that can be
     installed.
@@ -102,7 +107,15 @@ class BuildableFromSources(Buildable):
 
         rel_names = []
 
+        # Most names (eg. generated sources) will be in the build directory so
+        # handle them without the overhead of os.path.relpath().
+        build_dir_prefix = os.path.join(os.path.abspath(self.build_dir), '')
+
         for fn in names:
+            if fn.startswith(build_dir_prefix):
+                rel_names.append(fn[len(build_dir_prefix):])
+                continue
+
             try:
                 common = os.path.commonpath([fn, self.build_dir])
                 _, common = os.path.splitdrive(common)
@@ -152,14 +165,10 @@ class BuildableModule(BuildableFromSources):
         if self.project.py_platform == 'win32':
             return '.pyd'
 
-        suffixes = importlib.machinery.EXTENSION_SUFFIXES
+        if self.uses_limited_api and _ABI3_SUFFIX is not None:
+            return _ABI3_SUFFIX
 
-        if self.uses_limited_api:
-            for s in suffixes:
-                if '.abi3' in s:
-                    return s
-
-        return suffixes[0]
+        return EXTENSION_SUFFIXES[0]
 
 
 class BuildableBindings(BuildableModule):
@@ -202,16 +211,15 @@ class BuildableBindings(BuildableModule):
         # Write the configuration file.
         bindings = self.bindings
 
+        sip_version_str = SIP_VERSION_STR if self.project.version_info else ''
+        tags = ', '.join(f'"{t}"' for t in bindings.tags)
+        disabled = ', '.join(f'"{f}"' for f in bindings.disabled_features)
+
         with open(config_path, 'w') as cf:
-            sip_version_str = SIP_VERSION_STR if self.project.version_info else ''
-            tags = ', '.join(['"{}"'.format(t) for t in bindings.tags])
-            disabled = ', '.join(
-                    ['"{}"'.format(f) for f in bindings.disabled_features])
-
-            cf.write("# Automatically generated configuration for {0}.\n".format(self.fq_name))
-            cf.write('''
-sip-version = "{}"
-sip-abi-version = "{}"
-module-tags = [{}]
-module-disabled-features = [{}]
-'''.format(sip_version_str, self.project.abi_version, tags, disabled))
+            cf.write(f'''# Automatically generated configuration for {self.fq_name}.
+
+sip-version = "{sip_version_str}"
+sip-abi-version = "{self.project.abi_version}"
+module-tags = [{tags}]
+module-disabled-features = [{disabled}]
+''')
@@ -23,6 +23,7 @@
 
 from abc import abstractmethod
 import glob
+import json
 import os
 import shutil
 import stat
@@ -30,7 +31,6 @@ import sys
 
 from .abstract_builder import AbstractBuilder
 from .buildable import BuildableFromSources
-from .code_generator import set_globals
 from .distinfo import write_metadata
 from .exceptions import UserException
 from .installable import Installable
@@ -39,6 +39,16 @@ from .py_versions import OLDEST_SUPPORTED_MINOR
 from .version import SIP_VERSION, SIP_VERSION_STR
 
 
+# The name of the file in a buildable's build directory that records the
+# settings it was last built with.
+_BUILD_SETTINGS_STAMP = '.sip-build-settings'
+
+# The environment variables that distutils and setuptools use to configure the
+# compiler and linker.
+_COMPILER_ENVIRONMENT = ('AR', 'ARFLAGS', 'CC', 'CFLAGS', 'CPP', 'CPPFLAGS',
+        'CXX', 'LDFLAGS', 'LDSHARED', 'ARCHFLAGS')
+
+
 class Builder(AbstractBuilder):
     """ The default base implementation of a project builder. """
 
@@ -72,8 +82,10 @@ class Builder(AbstractBuilder):
         sdist_name = '{}-{}'.format(project.name.replace('-', '_'),
                 project.version_str)
 
-        # Create the sdist root directory.
+        # Create the sdist root directory.  Remove any left over from a
+        # previous build.
         sdist_root = os.path.join(project.build_dir, sdist_name)
+        shutil.rmtree(sdist_root, ignore_errors=True)
         os.mkdir(sdist_root)
 
         # Get a list of all excluded files.
@@ -114,17 +126,12 @@ class Builder(AbstractBuilder):
         sdist_file = sdist_name + '.tar.gz'
         sdist_path = os.path.abspath(os.path.join(sdist_directory, sdist_file))
 
-        saved_cwd = os.getcwd()
-        os.chdir(project.build_dir)
-
         import tarfile
 
         tf = tarfile.open(sdist_path, 'w:gz', format=tarfile.PAX_FORMAT)
-        tf.add(sdist_name)
+        tf.add(sdist_root, arcname=sdist_name)
         tf.close()
 
-        os.chdir(saved_cwd)
-
         return sdist_file
 
     def build_wheel(self, wheel_directory):
@@ -134,8 +141,10 @@ class Builder(AbstractBuilder):
 
         project = self.project
 
-        # Create a temporary directory for the wheel.
+        # Create a temporary directory for the wheel.  Remove any left over
+        # from a previous build.
         wheel_build_dir = os.path.join(project.build_dir, 'wheel')
+        shutil.rmtree(wheel_build_dir, ignore_errors=True)
         os.mkdir(wheel_build_dir)
 
         # Build the wheel contents.
@@ -159,8 +168,7 @@ class Builder(AbstractBuilder):
             wheel_tag.append('cp3' + str(OLDEST_SUPPORTED_MINOR))
             wheel_tag.append('abi3')
         else:
-            major_minor = '{}{}'.format((sys.hexversion >> 24) & 0xff,
-                    (sys.hexversion >> 16) & 0xff)
+            major_minor = '{}{}'.format(*sys.version_info[:2])
 
             wheel_tag.append('cp{}'.format(major_minor))
 
@@ -199,20 +207,14 @@ class Builder(AbstractBuilder):
         wheel_path = os.path.abspath(os.path.join(wheel_directory, wheel_file))
 
         # Create the .whl file.
-        saved_cwd = os.getcwd()
-        os.chdir(wheel_build_dir)
-
         from zipfile import ZipFile, ZIP_DEFLATED
 
         with ZipFile(wheel_path, 'w', compression=ZIP_DEFLATED) as zf:
-            for dirpath, _, filenames in os.walk('.'):
+            for dirpath, _, filenames in os.walk(wheel_build_dir):
                 for filename in filenames:
-                    # This will result in a name with no leading '.'.
-                    name = os.path.relpath(os.path.join(dirpath, filename))
-
-                    zf.write(name)
+                    path = os.path.join(dirpath, filename)
 
-        os.chdir(saved_cwd)
+                    zf.write(path, os.path.relpath(path, wheel_build_dir))
 
         return wheel_file
 
@@ -233,6 +235,8 @@ class Builder(AbstractBuilder):
     def _generate_bindings(self):
         """ Generate the bindings for all enabled modules. """
 
+        from .code_generator import set_globals
+
         project = self.project
 
         abi_major_version, abi_minor_version = project.abi_version.split('.')
@@ -401,3 +405,61 @@ class Builder(AbstractBuilder):
                     stat.S_IROTH|stat.S_IXOTH)
 
         project.installables.append(installable)
+
+    def _build_settings_changed(self, buildable):
+        """ Return True if the settings that will be used to build a buildable
+        are different to those it was last built with.  Any record of the
+        previous settings is removed so that an interrupted build will be
+        treated as having changed settings.
+        """
+
+        stamp_path = os.path.join(buildable.build_dir, _BUILD_SETTINGS_STAMP)
+
+        try:
+            with open(stamp_path) as f:
+                old_settings = json.load(f)
+        except (OSError, ValueError):
+            old_settings = None
+
+        try:
+            os.remove(stamp_path)
+        except OSError:
+            pass
+
+        return old_settings != self._get_build_settings(buildable)
+
+    def _get_build_settings(self, buildable):
+        """ Return a JSON serialisable object of the settings that affect how
+        a buildable is built.
+        """
+
+        return {
+            'builder': type(self).__name__,
+            'python': sys.version,
+            'cache_tag': sys.implementation.cache_tag,
+            'py_debug': self.project.py_debug,
+            'debug': buildable.debug,
+            'uses_limited_api': buildable.uses_limited_api,
+            'define_macros': buildable.define_macros,
+            'extra_compile_args': buildable.extra_compile_args,
+            'extra_link_args': buildable.extra_link_args,
+            'extra_objects': buildable.extra_objects,
+            'include_dirs': buildable.include_dirs,
+            'libraries': buildable.libraries,
+            'library_dirs': buildable.library_dirs,
+            'environment': {name: os.environ.get(name)
+                    for name in _COMPILER_ENVIRONMENT},
+        }
+
+    def _save_build_settings(self, buildable):
+        """ Record the settings that a buildable has been built with.  Any
+        error is ignored.
+        """
+
+        stamp_path = os.path.join(buildable.build_dir, _BUILD_SETTINGS_STAMP)
+
+        try:
+            with open(stamp_path, 'w') as f:
+                json.dump(self._get_build_settings(buildable), f)
+        except OSError:
+            pass
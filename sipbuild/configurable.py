@@ -21,8 +21,6 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
-from packaging.markers import Marker
-
 from .exceptions import UserException
 from .pyproject import PyProjectOptionException
 
@@ -108,12 +106,16 @@ class Configurable:
         section = pyproject.get_section(section_name)
 
         if section is not None:
+            # Map the user names to the options.  If more than one option has
+            # the same name then the first one is used.
+            options = {}
+            for option in self.get_options():
+                options.setdefault(option.user_name, option)
+
             for name, value in section.items():
                 # Find the corresponding option.
-                for option in self.get_options():
-                    if option.user_name == name:
-                        break
-                else:
+                option = options.get(name)
+                if option is None:
                     raise PyProjectOptionException(name,
                             "is not a supported option",
                             section_name=section_name)
@@ -158,11 +160,11 @@ class Configurable:
 
         # Set the value for each option from the keyword arguments or undefined
         # if not specified.
-        names = []
+        names = set()
 
         for option in self.get_options():
             name = option.name
-            names.append(name)
+            names.add(name)
 
             setattr(self, name, kwargs.get(name))
 
@@ -220,6 +222,8 @@ class Configurable:
         if ';' not in value:
             return value
 
+        from packaging.markers import Marker
+
         value, marker = value.split(';', maxsplit=1)
 
         try:
@@ -244,10 +248,10 @@ class Option:
     """
 
     # The tools that will build a set of bindings.
-    BUILD_TOOLS = ('build', 'install', 'pep517', 'wheel')
+    BUILD_TOOLS = frozenset(('build', 'install', 'pep517', 'wheel'))
 
     # All the valid tools.
-    _ALL_TOOLS = BUILD_TOOLS + ('sdist', )
+    _ALL_TOOLS = BUILD_TOOLS | {'sdist'}
 
     # This is used to make sure each option (even if they are handling the same
     # attribute) has a unique 'dest'.
@@ -49,10 +49,7 @@ def distinfo(name, console_scripts, gui_scripts, generator, inventory,
         installed = installed_lines.split('\n') if installed_lines else []
 
     # Get the pyproject.toml file.
-    saved = os.getcwd()
-    os.chdir(project_root)
-    pyproject = PyProject()
-    os.chdir(saved)
+    pyproject = PyProject(project_root)
 
     # Get the metadata and update it from the command line.
     metadata = pyproject.get_metadata()
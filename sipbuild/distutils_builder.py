@@ -21,12 +21,16 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+from concurrent.futures import ThreadPoolExecutor
+from distutils.ccompiler import CCompiler
 from distutils.command.build_ext import build_ext
+from distutils.dep_util import newer_group
 from distutils.dist import Distribution
 from distutils.extension import Extension
 from distutils.log import ERROR, INFO, set_threshold
 
 import os
+import shutil
 import sys
 
 from .buildable import BuildableModule
@@ -116,6 +120,7 @@ class DistutilsBuilder(Builder):
         module_builder = ExtensionCommand(distribution, buildable)
         module_builder.build_lib = buildable.build_dir
         module_builder.debug = buildable.debug
+        module_builder.parallel = True
 
         if buildable.debug:
             # Enable assert().
@@ -126,20 +131,14 @@ class DistutilsBuilder(Builder):
         # Convert the #defines.
         define_macros = []
         for macro in buildable.define_macros:
-            parts = macro.split('=', maxsplit=1)
-            name = parts[0]
-            try:
-                value = parts[1]
-            except IndexError:
-                value = None
-
-            define_macros.append((name, value))
+            name, sep, value = macro.partition('=')
+            define_macros.append((name, value if sep else None))
 
         buildable.make_names_relative()
 
         module_builder.extensions = [
             Extension(buildable.fq_name, buildable.sources,
-                    define_macros=define_macros,
+                    define_macros=define_macros, depends=buildable.headers,
                     extra_compile_args=buildable.extra_compile_args,
                     extra_link_args=buildable.extra_link_args,
                     extra_objects=buildable.extra_objects,
@@ -147,6 +146,22 @@ class DistutilsBuilder(Builder):
                     libraries=buildable.libraries,
                     library_dirs=buildable.library_dirs)]
 
+        # If the settings have changed then any existing object files and
+        # extension module are stale even if they are newer than their sources.
+        if self._build_settings_changed(buildable):
+            shutil.rmtree(
+                    os.path.join(buildable.build_dir,
+                            module_builder.build_temp),
+                    ignore_errors=True)
+
+            try:
+                os.remove(
+                        os.path.join(buildable.build_dir,
+                                module_builder.get_ext_fullpath(
+                                        buildable.fq_name)))
+            except OSError:
+                pass
+
         project.progress(
                 "Compiling the '{0}' module".format(buildable.fq_name))
 
@@ -156,6 +171,8 @@ class DistutilsBuilder(Builder):
         try:
             module_builder.run()
         except Exception as e:
+            os.chdir(saved_cwd)
+
             raise UserException(
                     "Unable to compile the '{0}' module".format(
                             buildable.fq_name),
@@ -170,6 +187,8 @@ class DistutilsBuilder(Builder):
 
         os.chdir(saved_cwd)
 
+        self._save_build_settings(buildable)
+
 
 class ExtensionCommand(build_ext):
     """ Extend the distutils command to build an extension module. """
@@ -181,7 +200,76 @@ class ExtensionCommand(build_ext):
 
         self._buildable = buildable
 
+    def build_extensions(self):
+        """ Reimplemented to only compile those sources that are newer than
+        their object files.
+        """
+
+        compiler = self.compiler
+        compile_source = compiler._compile
+
+        # Any change to a dependency (ie. a header, including the sip.h that
+        # a set of bindings is compiled against) may affect any source.  There
+        # is only ever the one extension.
+        depends = self.extensions[0].depends
+
+        def lazy_compile(obj, src, *args, **kwargs):
+            if self.force or newer_group([src] + depends, obj,
+                    missing='newer'):
+                compile_source(obj, src, *args, **kwargs)
+
+        # Note that not all compilers implement _compile() and so will always
+        # compile all sources.
+        compiler._compile = lazy_compile
+
+        # Compile the sources in parallel if the compiler's compile() is the
+        # default one that calls _compile() for each source.
+        parallel = (self.parallel and
+                type(compiler).compile is CCompiler.compile)
+
+        if parallel:
+            compiler.compile = self._parallel_compile
+
+        try:
+            super().build_extensions()
+        finally:
+            del compiler._compile
+
+            if parallel:
+                del compiler.compile
+
     def get_ext_filename(self, ext_name):
         """ Reimplemented to handle modules that use the limited API. """
 
         return os.path.join(*ext_name.split('.')) + self._buildable.get_module_extension()
+
+    def _parallel_compile(self, sources, output_dir=None, macros=None,
+            include_dirs=None, debug=0, extra_preargs=None,
+            extra_postargs=None, depends=None):
+        """ A replacement for CCompiler.compile() that compiles each source in
+        a separate thread.
+        """
+
+        compiler = self.compiler
+
+        setup = compiler._setup_compile(output_dir, macros, include_dirs,
+                sources, depends, extra_postargs)
+        macros, objects, extra_postargs, pp_opts, build = setup
+        cc_args = compiler._get_cc_args(pp_opts, debug, extra_preargs)
+
+        def compile_object(obj):
+            try:
+                src, ext = build[obj]
+            except KeyError:
+                return
+
+            compiler._compile(obj, src, ext, cc_args, extra_postargs, pp_opts)
+
+        jobs = os.cpu_count() if self.parallel is True else self.parallel
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            # Make sure any exception is raised.
+            for _ in pool.map(compile_object, objects):
+                pass
+
+        return objects
@@ -0,0 +1,150 @@
+# Copyright (c) 2022, Riverbank Computing Limited
+# All rights reserved.
+#
+# This copy of SIP is licensed for use under the terms of the SIP License
+# Agreement.  See the file LICENSE for more details.
+#
+# This copy of SIP may also used under the terms of the GNU General Public
+# License v2 or v3 as published by the Free Software Foundation which can be
+# found in the files LICENSE-GPL2 and LICENSE-GPL3 included in this package.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import mmap
+import os
+import pickle
+
+
+def get_args_key(*args):
+    """ Return a key derived from the values of a number of arguments.  This
+    is the part of the key of a cached parse derived from the arguments to
+    the parser, and is also used to key the code generated from a parse.
+    """
+
+    key = hashlib.sha256()
+
+    for arg in args:
+        key.update(repr(arg).encode())
+        key.update(b'\0')
+
+    return key.hexdigest()
+
+
+def get_digest(path):
+    """ Return the digest of the contents of a file or None if there is no
+    such file.
+    """
+
+    try:
+        with open(path, 'rb') as f:
+            # Map the file rather than read it to avoid copying its contents.
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return hashlib.sha256(mm).hexdigest()
+            except ValueError:
+                # An empty file cannot be mapped.
+                return hashlib.sha256().hexdigest()
+    except OSError:
+        return None
+
+
+def load(cache_dir, name, args_key):
+    """ Return a 2-tuple of the full key and the value cached for a set of
+    bindings or None if there is no value or it is out of date.  It is out of
+    date if the arguments to the parser have changed or any of the files that
+    the parser looked for have changed, appeared or disappeared.
+    """
+
+    try:
+        with open(_cache_path(cache_dir, name), 'rb') as f:
+            entry_args_key, manifest = pickle.load(f)
+
+            if entry_args_key != args_key:
+                return None
+
+            paths = [path for path, _ in manifest]
+            if _get_manifest(paths) != manifest:
+                return None
+
+            value = pickle.load(f)
+    except Exception:
+        # A missing, truncated or otherwise stale entry is just a miss.
+        return None
+
+    return _get_key(args_key, manifest), value
+
+
+def store(cache_dir, name, args_key, dependencies, value):
+    """ Store a value in the cache for a set of bindings, replacing any
+    existing value, and return its full key.  dependencies is the list of the
+    pathnames of the files that the parser looked for.  Any error is ignored.
+    """
+
+    manifest = _get_manifest(list(dict.fromkeys(dependencies)))
+
+    cache_path = _cache_path(cache_dir, name)
+    tmp_path = cache_path + '.tmp'
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # The manifest is pickled separately so that it can be checked without
+        # unpickling the value.
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((args_key, manifest), f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(tmp_path, cache_path)
+    except (OSError, pickle.PicklingError, RecursionError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+    return _get_key(args_key, manifest)
+
+
+def _cache_path(cache_dir, name):
+    """ Return the pathname of the cache entry of a set of bindings. """
+
+    return os.path.join(cache_dir, name + '.pkl')
+
+
+def _get_key(args_key, manifest):
+    """ Return the full key of a cached parse. """
+
+    key = hashlib.sha256(args_key.encode())
+
+    for path, digest in manifest:
+        key.update(b'\0')
+        key.update(path.encode())
+        key.update(b'\0')
+        key.update(repr(digest).encode())
+
+    return key.hexdigest()
+
+
+def _get_manifest(paths):
+    """ Return a tuple of 2-tuples of the pathname and digest of each of a list
+    of files.
+    """
+
+    # There are typically many small files so hash them concurrently to hide
+    # the latency of a cold file system cache.  Each worker maps and hashes
+    # its file so only the digest is handed back.
+    with ThreadPoolExecutor() as pool:
+        return tuple(zip(paths, pool.map(get_digest, paths)))
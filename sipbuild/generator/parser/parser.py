@@ -25,11 +25,21 @@ from .parser_manager import ParserManager
 
 
 def parse(sip_file, hex_version, encoding, abi_version, tags,
-        disabled_features, protected_is_public, include_dirs, strict=True):
+        disabled_features, protected_is_public, include_dirs, strict=True,
+        dependencies=None):
     """ Parse a .sip specification file returning a corresponding Specification
     object and a list of the .sip files that define the module to be generated.
+    If dependencies is not None then the pathnames of all the files (including
+    .toml files) that the parser looked for, whether or not they were found,
+    are appended to it.
     """
 
-    return ParserManager(
-            hex_version, encoding, abi_version, tags, disabled_features,
-            protected_is_public, include_dirs, strict).parse(sip_file)
+    pm = ParserManager(hex_version, encoding, abi_version, tags,
+            disabled_features, protected_is_public, include_dirs, strict)
+
+    spec, sip_files = pm.parse(sip_file)
+
+    if dependencies is not None:
+        dependencies.extend(pm.dependencies)
+
+    return spec, sip_files
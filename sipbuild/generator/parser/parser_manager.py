@@ -77,6 +77,7 @@ class ParserManager:
 
         self.c_bindings = None
         self.code_block = None
+        self.dependencies = []
         self.module_state = None
         self.module_states = []
         self.paren_depth = 0
@@ -1527,7 +1528,7 @@ class ParserManager:
         sip_file = sip_file.replace('/', os.sep)
 
         # See if the file can be found.
-        if os.path.isfile(sip_file):
+        if self._is_file(sip_file):
             pass
         else:
             found = None
@@ -1540,7 +1541,7 @@ class ParserManager:
 
                 for inc_dir in inc_dirs:
                     fn = os.path.join(inc_dir, sip_file)
-                    if os.path.isfile(fn):
+                    if self._is_file(fn):
                         found = fn
                         break
 
@@ -1580,7 +1581,8 @@ class ParserManager:
 
                 # Get the configuration of the new module.
                 mod_tags, mod_disabled = get_bindings_configuration(
-                        self._abi_version[0], sip_file, self._include_dirs)
+                        self._abi_version[0], sip_file, self._include_dirs,
+                        dependencies=self.dependencies)
 
                 for tag in mod_tags:
                     if tag not in self.tags:
@@ -2086,9 +2088,20 @@ class ParserManager:
         # call_super_init defaults to False if it wasn't specified.
         module.call_super_init = bool(module_state.call_super_init)
 
+    def _is_file(self, path):
+        """ Return True if a path names an existing file.  The path is added
+        to the list of dependencies whether or not it exists.
+        """
+
+        self.dependencies.append(os.path.abspath(path))
+
+        return os.path.isfile(path)
+
     def _read(self, sip_file):
         """ Return the contents of the current .sip file. """
 
+        self.dependencies.append(sip_file)
+
         try:
             with open(sip_file, encoding=self._encoding) as f:
                 self._input = f.read()
@@ -21,7 +21,9 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+from functools import lru_cache
 import os
+import re
 
 from ..exceptions import UserException
 
@@ -29,6 +31,11 @@ from ..exceptions import UserException
 # The directory containing the different module implementations.
 _module_source_dir = os.path.join(os.path.dirname(__file__), 'source')
 
+# The regular expression that extracts the version numbers from sip.h.in.
+_VERSION_RE = re.compile(
+        rb'^\s*#define\s+(SIP_ABI_MINOR_VERSION|SIP_MODULE_PATCH_VERSION)\s+(\S+)\s*$',
+        re.MULTILINE)
+
 
 def get_module_source_dir(abi_major_version):
     """ Return the name of the directory containing the latest source of the
@@ -38,25 +45,19 @@ def get_module_source_dir(abi_major_version):
     return os.path.join(_module_source_dir, abi_major_version)
 
 
+@lru_cache(maxsize=None)
 def get_sip_module_version(abi_major_version):
     """ Return the version number of the latest implementation of the sip
     module with the given ABI as a string.
     """
 
-    abi_minor_version = patch_version = None
-
     # Read the version from the header file shared with the code generator.
-    with open(os.path.join(get_module_source_dir(abi_major_version), 'sip.h.in')) as vf:
-        for line in vf:
-            parts = line.strip().split()
-            if len(parts) == 3 and parts[0] == '#define':
-                name = parts[1]
-                value = parts[2]
-
-                if name == 'SIP_ABI_MINOR_VERSION':
-                    abi_minor_version = value
-                elif name == 'SIP_MODULE_PATCH_VERSION':
-                    patch_version = value
+    with open(os.path.join(get_module_source_dir(abi_major_version), 'sip.h.in'), 'rb') as vf:
+        versions = {name: value.decode()
+                for name, value in _VERSION_RE.findall(vf.read())}
+
+    abi_minor_version = versions.get(b'SIP_ABI_MINOR_VERSION')
+    patch_version = versions.get(b'SIP_MODULE_PATCH_VERSION')
 
     # These are internal errors and should never happen.
     if abi_minor_version is None:
@@ -70,6 +71,7 @@ def get_sip_module_version(abi_major_version):
     return f'{abi_major_version}.{abi_minor_version}.{patch_version}'
 
 
+@lru_cache(maxsize=None)
 def resolve_abi_version(abi_version, module=True):
     """ Return a valid ABI version or the latest if none was given. """
 
@@ -78,7 +80,7 @@ def resolve_abi_version(abi_version, module=True):
         parts = abi_version.split('.')
         abi_major_version = parts[0]
 
-        if not os.path.isdir(get_module_source_dir(abi_major_version)):
+        if abi_major_version not in _available_versions():
             raise UserException(
                     f"'{abi_version}' is not a supported ABI version")
 
@@ -94,7 +96,7 @@ def resolve_abi_version(abi_version, module=True):
                 raise UserException(
                         f"'{abi_version}' is not a valid ABI version")
     else:
-        abi_major_version = sorted(os.listdir(_module_source_dir), key=int)[-1]
+        abi_major_version = _available_versions()[-1]
         minimum_minor_version = 0
 
     # Get the minor version of what we actually have.
@@ -111,3 +113,14 @@ def resolve_abi_version(abi_version, module=True):
 
     # Return the required version.
     return f'{abi_major_version}.{minimum_minor_version}'
+
+
+@lru_cache(maxsize=None)
+def _available_versions():
+    """ Return a sorted tuple of the ABI major versions that are implemented.
+    """
+
+    with os.scandir(_module_source_dir) as it:
+        versions = [e.name for e in it if e.is_dir(follow_symlinks=False)]
+
+    return tuple(sorted(versions, key=int))
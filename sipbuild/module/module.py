@@ -21,9 +21,9 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
+import filecmp
 import os
 import shutil
-import subprocess
 import sys
 
 from ..version import SIP_VERSION, SIP_VERSION_STR
@@ -98,7 +98,9 @@ def copy_nonshared_sources(abi_major_version, target_dir):
         if fn.endswith('.c') or fn.endswith('.cpp') or fn.endswith('.h'):
             src_fn = os.path.join(module_source_dir, fn)
             dst_fn = os.path.join(target_dir, fn)
-            shutil.copyfile(src_fn, dst_fn)
+
+            if not _is_same_file(src_fn, dst_fn):
+                shutil.copyfile(src_fn, dst_fn)
 
             if not fn.endswith('.h'):
                 sources.append(dst_fn)
@@ -179,14 +181,12 @@ def _create_sdist(sdist_dir, abi_version, patches, setup_cfg):
 
     # Create the sdist file using setuptools.  This means any user supplied
     # setup.cfg should be handled correctly.
-    saved_cwd = os.getcwd()
-    os.chdir(sdist_dir)
+    import subprocess
 
     subprocess.run(
             [sys.executable, 'setup.py', '--quiet', 'sdist', '--dist-dir',
-                    '..'])
-
-    os.chdir(saved_cwd)
+                    '..'],
+            cwd=sdist_dir)
 
     # Tidy up.
     shutil.rmtree(sdist_dir)
@@ -219,6 +219,24 @@ def _install_file(name_in, name_out, patches):
     for patch_name, patch in patches.items():
         data = data.replace(patch_name, patch)
 
+    # Leave any existing file alone if it is unchanged so that anything that
+    # depends on it isn't needlessly rebuilt.
+    try:
+        with open(name_out) as f:
+            if f.read() == data:
+                return
+    except (FileNotFoundError, ValueError):
+        pass
+
     # Write the file.
     with open(name_out, 'w') as f:
         f.write(data)
+
+
+def _is_same_file(name1, name2):
+    """ Return True if two files exist and have the same contents. """
+
+    try:
+        return filecmp.cmp(name1, name2, shallow=False)
+    except FileNotFoundError:
+        return False
@@ -21,14 +21,11 @@
 # POSSIBILITY OF SUCH DAMAGE.
 
 
-import collections
+import io
 import os
-import packaging
 import shutil
-import subprocess
 import sys
 import sysconfig
-import tempfile
 import warnings
 
 from .abstract_builder import AbstractBuilder
@@ -78,7 +75,7 @@ class Project(AbstractProject, Configurable):
         Option('py_debug', option_type=bool),
 
         # The name of the directory containing Python.h.
-        Option('py_include_dir', default=sysconfig.get_path('include')),
+        Option('py_include_dir'),
 
         # The name of the target Python platform.
         Option('py_platform'),
@@ -133,11 +130,14 @@ class Project(AbstractProject, Configurable):
         Option('scripts_dir', default=os.path.dirname(sys.executable),
                 help="the scripts installation directory", metavar="DIR",
                 tools=['build', 'install']),
-        Option('target_dir', default=sysconfig.get_path('platlib'),
+        Option('target_dir',
                 help="the target installation directory", metavar="DIR",
                 tools=['build', 'install']),
         Option('api_dir', help="generate a QScintilla .api file in DIR",
                 metavar="DIR"),
+        Option('clean', option_type=bool,
+                help="remove any existing build directory before building",
+                tools=['build']),
         Option('compile', option_type=bool, inverted=True,
                 help="disable the compilation of the generated code",
                 tools=['build']),
@@ -162,7 +162,7 @@ class Project(AbstractProject, Configurable):
 
         # The current directory should contain the .toml file.
         self.root_dir = os.getcwd()
-        self.bindings = collections.OrderedDict()
+        self.bindings = {}
         self.bindings_factories = []
         self.builder = None
         self.buildables = []
@@ -185,8 +185,7 @@ class Project(AbstractProject, Configurable):
                     Bindings)
 
         if self.py_major_version is None or self.py_minor_version is None:
-            self.py_major_version = sys.hexversion >> 24
-            self.py_minor_version = (sys.hexversion >> 16) & 0x0ff
+            self.py_major_version, self.py_minor_version = sys.version_info[:2]
 
         if self.builder_factory is None:
             if (self.py_major_version, self.py_minor_version) >= (3, 10):
@@ -206,6 +205,9 @@ class Project(AbstractProject, Configurable):
         if self.py_debug is None:
             self.py_debug = hasattr(sys, 'gettotalrefcount')
 
+        if self.py_include_dir is None:
+            self.py_include_dir = sysconfig.get_path('include')
+
         super().apply_nonuser_defaults(tool)
 
     def apply_user_defaults(self, tool):
@@ -220,17 +222,28 @@ class Project(AbstractProject, Configurable):
         if self.name is None:
             self.name = self.metadata['name']
 
-        # For the build tool we want build_dir to default to a local 'build'
-        # directory (which we won't remove).  However, for other tools (and for
-        # PEP 517 frontends) we want to use a temporary directory in case the
-        # current directory is read-only.
+        # The build directory can be given in the environment (eg. by a build
+        # system that wants all tools to reuse it).  Otherwise, for the build
+        # tool we want build_dir to default to a local 'build' directory
+        # (which we won't remove).  However, for other tools (and for PEP 517
+        # frontends) we want to use a temporary directory in case the current
+        # directory is read-only.
         if self.build_dir is None:
-            if tool == 'build':
+            env_build_dir = os.environ.get('SIP_BUILD_DIR')
+
+            if env_build_dir:
+                self.build_dir = env_build_dir
+            elif tool == 'build':
                 self.build_dir = 'build'
             else:
+                import tempfile
+
                 self._temp_build_dir = tempfile.TemporaryDirectory()
                 self.build_dir = self._temp_build_dir.name
 
+        if self.target_dir is None:
+            self.target_dir = sysconfig.get_path('platlib')
+
         super().apply_user_defaults(tool)
 
         # Adjust the list of bindings according to what has been explicitly
@@ -279,9 +292,10 @@ class Project(AbstractProject, Configurable):
         """ Return the name of the .dist-info directory for a target directory.
         """
 
+        distinfo_name = self.name.replace('-', '_')
+
         return os.path.join(target_dir,
-                '{}-{}.dist-info'.format(self.name.replace('-', '_'),
-                self.version_str))
+                f'{distinfo_name}-{self.version_str}.dist-info')
 
     def get_dunder_init(self):
         """ Return the contents of the __init__.py to install. """
@@ -315,10 +329,9 @@ class Project(AbstractProject, Configurable):
         """
 
         if self.sip_module:
-            name_parts = self.sip_module.split('.')
-            del name_parts[-1]
+            package_name = self.sip_module.rpartition('.')[0]
 
-            return os.path.join(*name_parts)
+            return package_name.replace('.', os.sep)
 
         return ''
 
@@ -379,14 +392,12 @@ class Project(AbstractProject, Configurable):
         # Ignore if the module is already defined.
         sip_project_name = self.sip_module.replace('.', '-')
 
-        for rd in requires_dist:
-            if rd.split()[0] == sip_project_name:
-                return []
+        if sip_project_name in {rd.split(maxsplit=1)[0] for rd in requires_dist}:
+            return []
 
         next_abi_major = int(self.abi_version.split('.')[0]) + 1
 
-        return ['{} (>={}, <{})'.format(sip_project_name, self.abi_version,
-                next_abi_major)]
+        return [f'{sip_project_name} (>={self.abi_version}, <{next_abi_major})']
 
     def get_sip_distinfo_command_line(self, sip_distinfo, inventory,
             generator=None, wheel_tag=None):
@@ -518,7 +529,7 @@ class Project(AbstractProject, Configurable):
         """ Print a progress message unless they are disabled. """
 
         if not self.quiet:
-            if message[-1] != '.':
+            if not message.endswith('.'):
                 message += '...'
 
             print(message, flush=True)
@@ -528,19 +539,17 @@ class Project(AbstractProject, Configurable):
         to be relate to the project directory or some other provided directory.
         """
 
-        path = os.path.normpath(path)
-
-        if os.path.isabs(path):
-            return path
-
         if relative_to is None:
             relative_to = self.root_dir
 
+        # Note that an absolute path will be returned unchanged by the join.
         return os.path.normpath(os.path.join(relative_to, path))
 
     def read_command_pipe(self, args, *, and_stderr=False, fatal=True):
         """ A generator for each line of a pipe from a command's stdout. """
 
+        import subprocess
+
         cmd = ' '.join(args)
 
         if self.verbose:
@@ -548,10 +557,22 @@ class Project(AbstractProject, Configurable):
 
         stderr = subprocess.STDOUT if and_stderr else subprocess.PIPE
 
-        with subprocess.Popen(cmd, shell=True, stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE, stderr=stderr) as pipe:
-            for line in pipe.stdout:
-                yield str(line, encoding=sys.stdout.encoding)
+        # Run the command directly rather than via a shell.
+        try:
+            pipe = subprocess.Popen(args, stdin=subprocess.DEVNULL,
+                    stdout=subprocess.PIPE, stderr=stderr)
+        except OSError as e:
+            if fatal:
+                raise UserException("'{0}' failed".format(cmd),
+                        detail=str(e))
+
+            return
+
+        with pipe:
+            # Decode the output as a stream rather than line by line.
+            yield from io.TextIOWrapper(pipe.stdout,
+                    encoding=sys.stdout.encoding, errors='replace',
+                    newline='\n')
 
         if pipe.returncode != 0 and fatal:
             raise UserException(
@@ -560,11 +581,33 @@ class Project(AbstractProject, Configurable):
     def run_command(self, args, *, fatal=True):
         """ Run a command and display the output if requested. """
 
-        # Read stdout and stderr until there is no more output.
-        for line in self.read_command_pipe(args, and_stderr=True, fatal=fatal):
-            if self.verbose:
+        if self.verbose:
+            # Read stdout and stderr until there is no more output.
+            for line in self.read_command_pipe(args, and_stderr=True,
+                    fatal=fatal):
                 sys.stdout.write(line)
 
+            return
+
+        import subprocess
+
+        # The output isn't needed so let it be discarded without reading it.
+        try:
+            returncode = subprocess.run(args, stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL).returncode
+        except OSError as e:
+            if fatal:
+                raise UserException("'{0}' failed".format(' '.join(args)),
+                        detail=str(e))
+
+            return
+
+        if returncode != 0 and fatal:
+            raise UserException(
+                    "'{0}' failed returning {1}".format(' '.join(args),
+                            returncode))
+
     def setup(self, pyproject, tool, tool_description):
         """ Complete the configuration of the project. """
 
@@ -597,19 +640,25 @@ class Project(AbstractProject, Configurable):
         if not self.verbose:
             warnings.simplefilter('ignore', UserWarning)
 
-        # Make sure we have a clean build directory and make it current.
+        # Make sure we have a build directory.  Unless a clean build was asked
+        # for, any existing one is reused so that anything that hasn't changed
+        # since the last build (eg. object files) doesn't need to be rebuilt.
         if self._temp_build_dir is None:
             self.build_dir = os.path.abspath(self.build_dir)
-            shutil.rmtree(self.build_dir, ignore_errors=True)
-            os.mkdir(self.build_dir)
 
-        os.chdir(self.build_dir)
+            if self.clean:
+                shutil.rmtree(self.build_dir, ignore_errors=True)
+
+            os.makedirs(self.build_dir, exist_ok=True)
 
         # Allow a sub-class (in a user supplied script) to make any updates to
         # the configuration.
-        self.update(tool)
+        os.chdir(self.build_dir)
 
-        os.chdir(self.root_dir)
+        try:
+            self.update(tool)
+        finally:
+            os.chdir(self.root_dir)
 
         # Make sure the configuration is correct after any user supplied script
         # has messed with it.
@@ -734,8 +783,8 @@ class Project(AbstractProject, Configurable):
         if len(self.bindings) < 2:
             # Remove the options that only make sense where the project has
             # multiple bindings.
-            for multi in self._multibindings_options:
-                options.remove(multi)
+            options = [o for o in options
+                    if o not in self._multibindings_options]
 
         self.add_command_line_options(parser, tool, all_options,
                 options=options)
@@ -746,13 +795,17 @@ class Project(AbstractProject, Configurable):
             bindings.add_command_line_options(parser, tool, all_options)
 
         # Parse the arguments and update the corresponding configurables.
-        args = parser.parse_args()
+        args = vars(parser.parse_args())
 
         for option, configurables in all_options.items():
+            # Options that weren't specified are suppressed.
+            try:
+                value = args[option.dest]
+            except KeyError:
+                continue
+
             for configurable in configurables:
-                if hasattr(args, option.dest):
-                    setattr(configurable, option.name,
-                            getattr(args, option.dest))
+                setattr(configurable, option.name, value)
 
     @staticmethod
     def _convert_major_minor(value):
@@ -770,31 +823,34 @@ class Project(AbstractProject, Configurable):
         """ Check the enabled bindings are valid and remove any disabled ones.
         """
 
-        names = list(self.bindings.keys())
+        # Handle the common case of nothing explicitly enabled or disabled.
+        if not self.enable and not self.disable:
+            return
+
+        names = self.bindings.keys()
 
-        # Check that any explicitly enabled bindings are valid.
+        # Check that any explicitly enabled or disabled bindings are valid.
         if self.enable:
             for enabled in self.enable:
                 if enabled not in names:
                     raise UserException(
                             "Unknown enabled bindings '{0}'".format(enabled))
 
-            # Only include explicitly enabled bindings.
-            for b in list(self.bindings.values()):
-                if b.name not in self.enable:
-                    del self.bindings[b.name]
-
-        # Check that any explicitly disabled bindings are valid.
         if self.disable:
             for disabled in self.disable:
                 if disabled not in names:
                     raise UserException(
                             "Unknown disabled bindings '{0}'".format(disabled))
 
-            # Remove any explicitly disabled bindings.
-            for b in list(self.bindings.values()):
-                if b.name in self.disable:
-                    del self.bindings[b.name]
+        # Only include explicitly enabled bindings and then remove any
+        # explicitly disabled ones.
+        keep = set(self.enable) if self.enable else set(names)
+
+        if self.disable:
+            keep.difference_update(self.disable)
+
+        for name in [name for name in names if name not in keep]:
+            del self.bindings[name]
 
     def _remove_build_dir(self):
         """ Remove the build directory. """
@@ -804,6 +860,8 @@ class Project(AbstractProject, Configurable):
     def _set_initial_configuration(self, pyproject, tool):
         """ Set the project's initial configuration. """
 
+        from packaging.version import parse
+
         # Get the metadata and extract the version.
         self.metadata = pyproject.get_metadata()
         self._metadata_overrides = self.get_metadata_overrides()
@@ -811,23 +869,22 @@ class Project(AbstractProject, Configurable):
         self.version_str = self.metadata['version']
 
         # Convert the version as a string to number.
-        base_version = packaging.version.parse(self.version_str).base_version
-        base_version = base_version.split('.')
+        base_version = parse(self.version_str).base_version
 
-        while len(base_version) < 3:
-            base_version.append('0')
+        try:
+            base_version = [int(part) for part in base_version.split('.')]
+        except ValueError:
+            raise PyProjectOptionException('version',
+                    "'{0}' is an invalid version number".format(
+                            self.version_str),
+                    section_name='tool.sip.metadata')
+
+        if len(base_version) < 3:
+            base_version.extend([0] * (3 - len(base_version)))
 
         version = 0
         for part in base_version:
-            version <<= 8
-
-            try:
-                version += int(part)
-            except ValueError:
-                raise PyProjectOptionException('version',
-                        "'{0}' is an invalid version number".format(
-                                self.version_str),
-                        section_name='tool.sip.metadata')
+            version = (version << 8) + part
 
         self.version = version
 
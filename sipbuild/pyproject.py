@@ -22,7 +22,13 @@
 
 
 from collections import OrderedDict
-import toml
+import os
+
+try:
+    # Python v3.11 and later include a much faster parser.
+    import tomllib
+except ImportError:
+    tomllib = None
 
 from .exceptions import UserFileException, UserParseException
 from .py_versions import OLDEST_SUPPORTED_MINOR
@@ -63,15 +69,25 @@ class PyProjectUndefinedOptionException(PyProjectOptionException):
 class PyProject:
     """ Encapsulate a parsed pyproject.toml file. """
 
-    def __init__(self):
-        """ Initialise the object. """
+    def __init__(self, root_dir=None):
+        """ Initialise the object.  The pyproject.toml file is read from the
+        given directory or the current directory if it is not specified.
+        """
 
         self.toml_error = None
 
+        toml_file = 'pyproject.toml'
+        if root_dir is not None:
+            toml_file = os.path.join(root_dir, toml_file)
+
         try:
-            self._pyproject = toml.load('pyproject.toml', _dict=OrderedDict)
+            self._pyproject = _load_toml(toml_file)
         except FileNotFoundError:
-            self.toml_error = "there is no such file in the current directory"
+            if root_dir is None:
+                self.toml_error = "there is no such file in the current directory"
+            else:
+                self.toml_error = "there is no such file in '{0}'".format(
+                        root_dir)
         except Exception as e:
             self.toml_error = str(e)
 
@@ -175,3 +191,30 @@ class PyProject:
         """ Returns True if a section value is itself a section. """
 
         return isinstance(value, (OrderedDict, list))
+
+
+def _load_toml(toml_file):
+    """ Return the contents of a TOML file with each table as an OrderedDict.
+    """
+
+    if tomllib is None:
+        import toml
+
+        return toml.load(toml_file, _dict=OrderedDict)
+
+    with open(toml_file, 'rb') as f:
+        return _ordered(tomllib.load(f))
+
+
+def _ordered(value):
+    """ Return a value parsed by tomllib with each table converted to an
+    OrderedDict.
+    """
+
+    if isinstance(value, dict):
+        return OrderedDict((k, _ordered(v)) for k, v in value.items())
+
+    if isinstance(value, list):
+        return [_ordered(v) for v in value]
+
+    return value
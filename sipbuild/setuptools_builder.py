@@ -22,6 +22,7 @@
 
 
 import os
+import shutil
 import sys
 
 from setuptools import Distribution, Extension, setup
@@ -128,20 +129,14 @@ class SetuptoolsBuilder(Builder):
         # Handle preprocessor macros.
         define_macros = []
         for macro in buildable.define_macros:
-            parts = macro.split('=', maxsplit=1)
-            name = parts[0]
-            try:
-                value = parts[1]
-            except IndexError:
-                value = None
-
-            define_macros.append((name, value))
+            name, sep, value = macro.partition('=')
+            define_macros.append((name, value if sep else None))
 
         buildable.make_names_relative()
 
         setup_args['ext_modules'] = [
             Extension(buildable.fq_name, buildable.sources,
-                    define_macros=define_macros,
+                    define_macros=define_macros, depends=buildable.headers,
                     extra_compile_args=buildable.extra_compile_args,
                     extra_link_args=buildable.extra_link_args,
                     extra_objects=buildable.extra_objects,
@@ -150,6 +145,13 @@ class SetuptoolsBuilder(Builder):
                     library_dirs=buildable.library_dirs,
                     py_limited_api=buildable.uses_limited_api)]
 
+        # If the settings have changed then any existing object files and
+        # extension module (which setuptools puts in the build sub-directory)
+        # are stale even if they are newer than their sources.
+        if self._build_settings_changed(buildable):
+            shutil.rmtree(os.path.join(buildable.build_dir, 'build'),
+                    ignore_errors=True)
+
         project.progress(
                 "Compiling the '{0}' module".format(buildable.fq_name))
 
@@ -159,6 +161,8 @@ class SetuptoolsBuilder(Builder):
         try:
             distribution = setup(**setup_args)
         except Exception as e:
+            os.chdir(saved_cwd)
+
             raise UserException(
                     "Unable to compile the '{0}' module".format(
                             buildable.fq_name),
@@ -175,3 +179,5 @@ class SetuptoolsBuilder(Builder):
         buildable.installables.append(installable)
 
         os.chdir(saved_cwd)
+
+        self._save_build_settings(buildable)
@@ -0,0 +1,255 @@
+# Copyright (c) 2022, Riverbank Computing Limited
+# All rights reserved.
+#
+# This copy of SIP is licensed for use under the terms of the SIP License
+# Agreement.  See the file LICENSE for more details.
+#
+# This copy of SIP may also used under the terms of the GNU General Public
+# License v2 or v3 as published by the Free Software Foundation which can be
+# found in the files LICENSE-GPL2 and LICENSE-GPL3 included in this package.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+
+class IncrementalBuildTestCase(unittest.TestCase):
+    """ Test that rebuilding a project in an existing build directory picks up
+    every change that affects the result.
+    """
+
+    def setUp(self):
+        """ Create an empty project directory. """
+
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.project_dir = self._tmp_dir.name
+        self.build_dir = os.path.join(self.project_dir, 'build')
+
+    def tearDown(self):
+        """ Remove the project directory. """
+
+        self._tmp_dir.cleanup()
+
+    def test_no_op_rebuild(self):
+        """ Test that rebuilding an unchanged project reuses the parse, the
+        generated code and the extension module.
+        """
+
+        self.write_project("""
+[tool.sip.bindings.incremental]
+define-macros = ["VALUE=1"]
+""")
+        self.write_file('sip/incremental.sip', _MODULE_SIP)
+
+        self.sip_build()
+
+        outputs = [
+            os.path.join(self.build_dir, '.sip-parse-cache',
+                    'incremental.pkl'),
+            os.path.join(self.build_dir, 'incremental',
+                    'sipincrementalcmodule.c'),
+            self.get_module_path(),
+        ]
+        mtimes = [os.stat(o).st_mtime_ns for o in outputs]
+
+        self.sip_build()
+
+        self.assertEqual([os.stat(o).st_mtime_ns for o in outputs], mtimes)
+        self.assertEqual(self.get_value(), 1)
+
+    def test_included_sip_file(self):
+        """ Test that a change to a %Included .sip file is picked up. """
+
+        self.write_project()
+        self.write_file('sip/incremental.sip', _MODULE_SIP + """
+%Include included.sip
+""")
+        self.write_file('sip/included.sip', "int first();\n")
+
+        self.sip_build('--no-compile')
+        self.assertIn('first', self.read_generated_code())
+
+        self.write_file('sip/included.sip', "int second();\n")
+
+        self.sip_build('--no-compile')
+        code = self.read_generated_code()
+        self.assertIn('second', code)
+        self.assertNotIn('first', code)
+
+    def test_included_file_relative_to_project(self):
+        """ Test that a change to a %Included file with a non-.sip extension
+        found relative to the project directory is picked up.
+        """
+
+        self.write_project()
+        self.write_file('sip/incremental.sip', _MODULE_SIP + """
+%Include extra/other.inc
+""")
+        self.write_file('extra/other.inc', "int first();\n")
+
+        self.sip_build('--no-compile')
+        self.assertIn('first', self.read_generated_code())
+
+        self.write_file('extra/other.inc', "int second();\n")
+
+        self.sip_build('--no-compile')
+        code = self.read_generated_code()
+        self.assertIn('second', code)
+        self.assertNotIn('first', code)
+
+    def test_optional_included_file(self):
+        """ Test that an optional %Included file that appears is picked up.
+        """
+
+        self.write_project()
+        self.write_file('sip/incremental.sip', _MODULE_SIP + """
+%Include(name=missing.sip, optional=True)
+""")
+
+        self.sip_build('--no-compile')
+        self.assertNotIn('first', self.read_generated_code())
+
+        self.write_file('sip/missing.sip', "int first();\n")
+
+        self.sip_build('--no-compile')
+        self.assertIn('first', self.read_generated_code())
+
+    def test_compile_options(self):
+        """ Test that a change to the compile options of the bindings causes
+        the extension module to be rebuilt.
+        """
+
+        self.write_project("""
+[tool.sip.bindings.incremental]
+define-macros = ["VALUE=1"]
+""")
+        self.write_file('sip/incremental.sip', _MODULE_SIP)
+
+        self.sip_build()
+        self.assertEqual(self.get_value(), 1)
+
+        self.write_project("""
+[tool.sip.bindings.incremental]
+define-macros = ["VALUE=2"]
+""")
+
+        self.sip_build()
+        self.assertEqual(self.get_value(), 2)
+
+    def test_clean(self):
+        """ Test that --clean removes the contents of an existing build
+        directory.
+        """
+
+        self.write_project()
+        self.write_file('sip/incremental.sip', _MODULE_SIP)
+
+        self.sip_build('--no-compile')
+
+        stale = os.path.join(self.build_dir, 'stale.txt')
+        self.write_file(stale, "stale\n")
+
+        self.sip_build('--no-compile')
+        self.assertTrue(os.path.isfile(stale))
+
+        self.sip_build('--no-compile', '--clean')
+        self.assertFalse(os.path.exists(stale))
+        self.assertIn('value', self.read_generated_code())
+
+    def get_module_path(self):
+        """ Return the pathname of the built extension module. """
+
+        # The distutils and setuptools builders leave the module in different
+        # places.
+        module_name = 'incremental*' + (
+                '.pyd' if sys.platform == 'win32' else '.so')
+        module_paths = glob.glob(
+                os.path.join(self.build_dir, 'incremental', '**',
+                        module_name),
+                recursive=True)
+
+        self.assertEqual(len(module_paths), 1)
+
+        return module_paths[0]
+
+    def get_value(self):
+        """ Return the value returned by the built extension module. """
+
+        # Import the module in a separate interpreter as a module that has
+        # already been imported cannot be reloaded.
+        module_dir = os.path.dirname(self.get_module_path())
+        result = subprocess.run(
+                [sys.executable, '-c',
+                        'import incremental; print(incremental.value())'],
+                cwd=module_dir, stdout=subprocess.PIPE, check=True)
+
+        return int(result.stdout)
+
+    def read_generated_code(self):
+        """ Return the generated module code. """
+
+        with open(os.path.join(self.build_dir, 'incremental',
+                'sipincrementalcmodule.c')) as f:
+            return f.read()
+
+    def sip_build(self, *args):
+        """ Run sip-build in the project directory. """
+
+        subprocess.run(['sip-build'] + list(args), cwd=self.project_dir,
+                stdout=subprocess.DEVNULL, check=True)
+
+    def write_file(self, name, contents):
+        """ Write a file relative to the project directory. """
+
+        path = os.path.join(self.project_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'w') as f:
+            f.write(textwrap.dedent(contents))
+
+    def write_project(self, extra=''):
+        """ Write the pyproject.toml file. """
+
+        self.write_file('pyproject.toml', _PYPROJECT_TOML + extra)
+
+
+# The prototype pyproject.toml file.
+_PYPROJECT_TOML = """
+[build-system]
+requires = ["sip >=6"]
+build-backend = "sipbuild.api"
+
+[tool.sip.metadata]
+name = "incremental"
+
+[tool.sip.project]
+minimum-macos-version = "10.9"
+sip-files-dir = "sip"
+"""
+
+# The .sip file common to all tests.
+_MODULE_SIP = """
+%Module(name=incremental, language="C")
+
+int value();
+%MethodCode
+    sipRes = VALUE;
+%End
+"""